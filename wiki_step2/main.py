@@ -28,22 +28,19 @@ SaveHandler
 __author__ = 'appengine-support@google.com'
 
 # Python Imports
+# Every module imported here is paid for on cold start, so only what
+# this step actually uses belongs at the top level
 import os
-import sys
 import re
-import urllib
 import wsgiref.handlers
-import xml.dom.minidom
+from urllib import quote
 
 # Google App Engine Imports
-from google.appengine.api import mail
 from google.appengine.api import users
-from google.appengine.api import urlfetch
 from google.appengine.ext import webapp
 from google.appengine.ext.webapp import template
 
 # Wiki Imports
-from markdown import markdown
 from wiki_model import WikiContent
 from wiki_model import WikiRevision
 from wiki_model import WikiUser
@@ -119,6 +116,10 @@ class ViewHandler(BaseRequestHandler):
     entry = WikiContent.gql('WHERE title = :1', page_title).get()
 
     if entry:
+      # Markdown is a sizable pure-Python package, so import it only on
+      # the one path that renders a page; requests that never get here
+      # don't pay its import cost on cold start
+      from markdown import markdown
       # Retrieve the current version
       current_version = WikiRevision.gql('WHERE wiki_page =  :1 '
                                          'ORDER BY version_number DESC', entry).get()
@@ -126,7 +127,7 @@ class ViewHandler(BaseRequestHandler):
       # and revision date
       body = current_version.revision_body
       version = current_version.version_number
-      author_email = urllib.quote(current_version.author.wiki_user.email())
+      author_email = quote(current_version.author.wiki_user.email())
       author_nickname = current_version.author.wiki_user.nickname()
       version_date = current_version.created
       # Replace all wiki words with links to those wiki pages
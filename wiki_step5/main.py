@@ -34,9 +34,17 @@ SendAdminEmail - Handles request to send the admins email
 __author__ = 'appengine-support@google.com'
 
 # Python Imports
+import cStringIO
+import gzip
 import os
 import sys
-import re
+# re2 runs simple patterns like the wiki word below in linear time with
+# no backtracking, which matters when scanning whole page bodies.  It is
+# a C extension, so fall back to the stdlib engine where it can't load
+try:
+  import re2 as re
+except ImportError:
+  import re
 import urllib
 import wsgiref.handlers
 import xml.dom.minidom
@@ -48,23 +56,112 @@ from google.appengine.api import mail
 from google.appengine.api import memcache
 from google.appengine.api import users
 from google.appengine.api import urlfetch
+from google.appengine.ext import db
+from google.appengine.ext import deferred
 from google.appengine.ext import webapp
 from google.appengine.ext.webapp import template
 
+# Django Imports (Django is bundled with the App Engine runtime)
+from django.template import Context
+
 # Wiki Imports
 from markdown import markdown
 from wiki_model import WikiContent
 from wiki_model import WikiRevision
 from wiki_model import WikiUser
 
-# Set the debug level
-_DEBUG = True
+# Set the debug level.  Debug mode disables the template cache below and
+# wraps templates in debug machinery, so keep it off in production
+_DEBUG = False
+
+# Compiled templates cached per-process, keyed by absolute path.  Parsing
+# a Django template means reading the file from disk and running the
+# lexer and parser over it, so we only pay that cost once per template
+_TEMPLATE_CACHE = {}
 
 _ADMIN_EMAIL='hackathon.rsvp@gmail.com'
 # Regular expression for a wiki word.  Wiki words are all letters
 # As well as camel case.  For example: WikiWord
 _WIKI_WORD = re.compile('\\b([A-Z][a-z]+[A-Z][A-Za-z]+)\\b')
 
+
+def _linkify(body):
+  """Replaces each wiki word in body with a link to its view page.
+
+     _WIKI_WORD.split yields alternating literal text and captured wiki
+     words, so a single pass over that list builds the result without
+     the per-match replacement-template parsing that re.subn does
+  """
+  parts = _WIKI_WORD.split(body)
+  for index in xrange(1, len(parts), 2):
+    word = parts[index]
+    parts[index] = '<a href="/view/%s">%s</a>' % (word, word)
+  return ''.join(parts)
+
+
+def _get_wiki_user(user):
+  """Fetches the WikiUser profile for user, creating it if needed.
+
+     Profiles are keyed by user_id and cached in memcache, so repeat
+     lookups for an active user cost a memcache get instead of a
+     datastore query.  Profiles created before user_id became the
+     key_name are still found through the old query
+  """
+  cache_key = 'wu:%s' % user.user_id()
+  wiki_user = memcache.get(cache_key)
+  if wiki_user is None:
+    wiki_user = WikiUser.get_by_key_name(user.user_id())
+    if wiki_user is None:
+      wiki_user = WikiUser.gql('WHERE wiki_user = :1', user).get()
+    if wiki_user is None:
+      wiki_user = WikiUser(key_name=user.user_id(), wiki_user=user)
+      wiki_user.put()
+    memcache.set(cache_key, wiki_user)
+  return wiki_user
+
+
+def _warm_linked_pages(body):
+  """Primes the render cache for every page body links to.
+
+     The wiki-word pattern enumerates the outbound links, and each one
+     is a likely next click.  One batched entity get plus one memcache
+     multi-get/multi-set warms their rendered bodies, instead of each
+     future view paying its own fetch.  Runs as a deferred task so the
+     view that scheduled it never waits on these RPCs
+  """
+  titles = set(_WIKI_WORD.findall(body))
+  if not titles:
+    return
+
+  # One batched keyed get resolves every linked entry at once
+  targets = {}
+  for linked_entry in WikiContent.get_by_key_name(list(titles)):
+    if linked_entry is None or not linked_entry.latest_version:
+      continue
+    revision_key = \
+        WikiContent.current_revision.get_value_for_datastore(linked_entry)
+    if revision_key:
+      cache_key = 'wb:%s:%d' % (linked_entry.title,
+                                linked_entry.latest_version)
+      targets[cache_key] = revision_key
+
+  if not targets:
+    return
+  cached = memcache.get_multi(targets.keys())
+  missing = [key for key in targets if key not in cached]
+  if not missing:
+    return
+
+  # One batched get for the missing revisions, then prime them all
+  updates = {}
+  for cache_key, revision in zip(missing,
+                                 db.get([targets[key] for key in missing])):
+    if revision is not None and revision.rendered_body is not None:
+      updates[cache_key] = revision.rendered_body
+  if updates:
+    memcache.set_multi(updates)
+
+
 class BaseRequestHandler(webapp.RequestHandler):
   """Base request handler extends webapp.Request handler
 
@@ -72,6 +169,16 @@ class BaseRequestHandler(webapp.RequestHandler):
      in response to a web request
   """
 
+  def current_user(self):
+    """Returns the signed-in user, or None.
+
+       Memoized on the handler so users.get_current_user runs at most
+       once per request no matter how many places ask
+    """
+    if not hasattr(self, '_current_user'):
+      self._current_user = users.get_current_user()
+    return self._current_user
+
   def generate(self, template_name, template_values={}):
     """Generate takes renders and HTML template along with values
        passed to that template
@@ -83,7 +190,7 @@ class BaseRequestHandler(webapp.RequestHandler):
            is an empty dictionary.
     """
     # We check if there is a current user and generate a login or logout URL
-    user = users.get_current_user()
+    user = self.current_user()
 
     if user:
       log_in_out_url = users.create_logout_url('/view/StartPage')
@@ -98,8 +205,31 @@ class BaseRequestHandler(webapp.RequestHandler):
     directory = os.path.dirname(__file__)
     path = os.path.join(directory, 'templates', template_name)
 
-    # Respond to the request by rendering the template
-    self.response.out.write(template.render(path, values, debug=_DEBUG))
+    # Respond to the request by rendering the template.  The compiled
+    # template comes from the per-process cache; in debug mode we reload
+    # it from disk every time so edits show up without a restart
+    tpl = _TEMPLATE_CACHE.get(path)
+    if tpl is None or _DEBUG:
+      tpl = template.load(path, debug=_DEBUG)
+      _TEMPLATE_CACHE[path] = tpl
+    html = tpl.render(Context(values))
+
+    # Compress the page when the client allows it; HTML shrinks several
+    # fold, cutting egress bandwidth and time on the wire.  Responses
+    # under half a KB aren't worth the gzip header overhead
+    if (len(html) >= 512 and
+        'gzip' in self.request.headers.get('Accept-Encoding', '')):
+      compressed = cStringIO.StringIO()
+      stream = gzip.GzipFile(fileobj=compressed, mode='wb', compresslevel=4)
+      stream.write(html.encode('utf-8'))
+      stream.close()
+      self.response.headers['Content-Encoding'] = 'gzip'
+      # Tell intermediary caches the body depends on Accept-Encoding so
+      # the gzipped copy is never served to a client that can't take it
+      self.response.headers['Vary'] = 'Accept-Encoding'
+      self.response.out.write(compressed.getvalue())
+    else:
+      self.response.out.write(html)
 
 class MainHandler(BaseRequestHandler):
   """The MainHandler extends the base request handler, and handles all
@@ -118,17 +248,36 @@ class ViewHandler(BaseRequestHandler):
   """
 
   def get_page_content(self, page_title):
-    """When memcache lookup fails, we want to query the information from
-       the datastore and return it.  If the data isn't in the data store,
+    """Queries the page from the datastore and returns its display data.
+
+       The rendered HTML body is cached in memcache keyed by
+       (title, version number).  A save creates a new version number and
+       therefore a new key, so stale HTML is never served and no explicit
+       invalidation is needed.  If the page isn't in the datastore,
        simply return empty strings
     """
-    # Find the wiki entry
-    entry = WikiContent.gql('WHERE title = :1', page_title).get()
+    # Missing pages get hit repeatedly by bots and broken links, so a
+    # short-lived negative cache entry answers those without a datastore
+    # RPC.  SaveHandler deletes the entry when the page gets created
+    if memcache.get('nx:%s' % page_title):
+      entry = None
+    else:
+      # Find the wiki entry.  Titles are the entity key_name, so this is
+      # a direct keyed get rather than an index scan over the title
+      entry = WikiContent.get_by_key_name(page_title)
+      if entry is None:
+        memcache.set('nx:%s' % page_title, 1, time=60)
 
     if entry:
-      # Retrieve the current version
-      current_version = WikiRevision.gql('WHERE wiki_page =  :1 '
-                                         'ORDER BY version_number DESC', entry).get()
+      # Retrieve the current version with a keyed get on the denormalized
+      # revision key, one direct fetch instead of an ORDER BY query.
+      # Entries saved before the key existed fall back to the query
+      revision_key = WikiContent.current_revision.get_value_for_datastore(entry)
+      if revision_key:
+        current_version = db.get(revision_key)
+      else:
+        current_version = WikiRevision.gql('WHERE wiki_page =  :1 '
+                                           'ORDER BY version_number DESC', entry).get()
       # Define the body, version number, author email, author nickname
       # and revision date
       body = current_version.revision_body
@@ -136,11 +285,19 @@ class ViewHandler(BaseRequestHandler):
       author_email = urllib.quote(current_version.author.wiki_user.email())
       author_nickname = current_version.author.wiki_user.nickname()
       version_date = current_version.created
-      # Replace all wiki words with links to those wiki pages
-      wiki_body, count = _WIKI_WORD.subn(r'<a href="/view/\1">\1</a>',
-                                         body)
-      # Markdown the body to allow formatting of the wiki page
-      wiki_body = markdown.markdown(wiki_body)
+      # The regex and markdown passes are CPU-bound and their output is
+      # fully determined by (title, version), so check memcache first
+      cache_key = 'wb:%s:%d' % (page_title, version)
+      wiki_body = memcache.get(cache_key)
+      if wiki_body is None:
+        # Revisions rendered at save time carry their HTML; older ones
+        # are rendered here once and served from cache afterwards
+        wiki_body = current_version.rendered_body
+        if wiki_body is None:
+          # Replace all wiki words with links to those wiki pages, then
+          # markdown the body to allow formatting of the wiki page
+          wiki_body = markdown.markdown(_linkify(body))
+        memcache.set(cache_key, wiki_body)
     else:
       # These things do not exist
       wiki_body = ''
@@ -148,32 +305,20 @@ class ViewHandler(BaseRequestHandler):
       author_nickname = ''
       version = ''
       version_date = ''
+      body = ''
 
-    return [wiki_body, author_email, author_nickname, version, version_date]
-
-  def get_content(self, page_title):
-    """Checks memcache for the page.  If the page exists in memcache, it
-       returns the information.  If not, it calls get_page_content, gets the
-       page content from the datastore and sets the memcache with that info
-    """
-    # check memcache
-    page_content = memcache.get(page_title)
-    # if it is there, return it, or get the info and set it to memcache
-    if page_content is not None:
-      return page_content
-    else:
-      page_content = self.get_page_content(page_title)
-      memcache.set(page_title, page_content, 600)
-    return page_content
+    return [wiki_body, author_email, author_nickname, version, version_date,
+            body]
 
   def get(self, page_title):
-    """When we receive an HTTP Get request to the view pages, we query for
-       the data, which comes either from the cache, if it exists.  If it 
-       doesn't exist in the cache, we try the datastore, if not there, we 
-       return empty strings.
+    """When we receive an HTTP Get request to the view pages, we query
+       the datastore for the page metadata; the rendered body comes from
+       memcache when the (title, version) key is warm.  If the page
+       doesn't exist, we return empty strings.
     """
 
-    wiki_body, author_email, author_nickname, version, version_date = self.get_content(page_title)
+    (wiki_body, author_email, author_nickname, version, version_date,
+     source_body) = self.get_page_content(page_title)
 
     # Render the template view.html, which extends base.html
     self.generate('view.html', template_values={'page_title': page_title,
@@ -183,6 +328,12 @@ class ViewHandler(BaseRequestHandler):
                                                 'version': version,
                                                 'version_date': version_date})
 
+    # Warm the render cache for the pages this one links to on the task
+    # queue; they are the likeliest next clicks, and deferring keeps the
+    # warm pass's RPCs off this request entirely
+    if _WIKI_WORD.search(source_body):
+      deferred.defer(_warm_linked_pages, source_body)
+
 
 class EditHandler(BaseRequestHandler):
   """When we receive an HTTP Get request to edit pages, we pull that
@@ -192,16 +343,24 @@ class EditHandler(BaseRequestHandler):
   """
   def get(self, page_title):
     # We require that the user be signed in to edit a page
-    current_user = users.get_current_user()
+    current_user = self.current_user()
 
     if not current_user:
       self.redirect(users.create_login_url('/edit/' + page_title))
 
-    # Get the entry along with the current version
-    entry = WikiContent.gql('WHERE title = :1', page_title).get()
+    # Get the entry with a keyed get, along with the current version
+    entry = WikiContent.get_by_key_name(page_title)
 
-    current_version = WikiRevision.gql('WHERE wiki_page = :1 '
-                                       'ORDER BY version_number DESC', entry).get()
+    # Fetch the current version by its denormalized key where available,
+    # falling back to the ORDER BY query for entries saved before the key
+    current_version = None
+    if entry:
+      revision_key = WikiContent.current_revision.get_value_for_datastore(entry)
+      if revision_key:
+        current_version = db.get(revision_key)
+    if not current_version:
+      current_version = WikiRevision.gql('WHERE wiki_page = :1 '
+                                         'ORDER BY version_number DESC', entry).get()
 
     # Generate edit template, which posts to the save handler
     self.generate('edit.html',
@@ -217,46 +376,74 @@ class SaveHandler(BaseRequestHandler):
 
   def post(self, page_title):
     # Again, only accept saves from a signed in user
-    current_user = users.get_current_user()
+    current_user = self.current_user()
 
     if not current_user:
       self.redirect(users.create_login_url('/edit/' + page_title))
 
-    # See if this user has a profile
-    wiki_user = WikiUser.gql('WHERE wiki_user = :1', current_user).get()
-
-    # If not, create the profile
-    if not wiki_user:
-      wiki_user = WikiUser(wiki_user=current_user)
-      wiki_user.put()
+    # Start the page lookup first; it is a keyed get now that titles are
+    # the entity key_name, and its RPC overlaps the profile lookup below
+    entry_future = db.get_async(db.Key.from_path('WikiContent', page_title))
 
     # get the user entered content in the form
     body = self.request.get('body')
 
+    # The user's profile, from memcache in the common case; created on
+    # the first save
+    wiki_user = _get_wiki_user(current_user)
+
     # Find the entry, if it exists
-    entry = WikiContent.gql('WHERE title = :1', page_title).get()
+    entry = entry_future.get_result()
 
-    # Generate the version number based on the entries previous existence
+    # Generate the version number from the denormalized counter on the
+    # entry, with no revision fetch at all.  Entries saved before the
+    # counter existed fall back to a keyed get on the current-revision
+    # key, and before that to the ORDER BY query
     if entry:
-      latest_version = WikiRevision.gql('WHERE wiki_page = :content'
-                                        ' ORDER BY version_number DESC', content=entry).get()
-      version_number = latest_version.version_number + 1
+      if entry.latest_version:
+        version_number = entry.latest_version + 1
+      else:
+        revision_key = WikiContent.current_revision.get_value_for_datastore(entry)
+        if revision_key:
+          latest_version = db.get(revision_key)
+        else:
+          # Projecting version_number keeps the revision bodies out of
+          # the RPC payload; only the number is wanted here
+          latest_version = db.Query(WikiRevision,
+                                    projection=('version_number',)) \
+              .filter('wiki_page =', entry).order('-version_number').get()
+        version_number = latest_version.version_number + 1
     else:
+      # The key_name makes the entity key complete without saving, so
+      # the new entry rides along in the batched put below
       version_number = 1
-      entry = WikiContent(title=page_title)
-      entry.put()
-
-    # Create a version for this entry
-    version = WikiRevision(version_number=version_number,
-                           revision_body=body, author=wiki_user,
-                           wiki_page=entry)
-    version.put()
-
-    # above, memcache sets the following:
-    # return [wiki_body, author_email, author_nickname, version, version_date]
-    content = [markdown.markdown(body), current_user.email(), 
-               current_user.nickname(), version_number, version.created]
-    memcache.set(page_title, content, 600)
+      entry = WikiContent(key_name=page_title, title=page_title)
+
+    # Render the body once here on the rare write path (wiki-word links,
+    # then markdown) so reads just emit the stored HTML
+    rendered_body = markdown.markdown(_linkify(body))
+
+    # Create a version for this entry.  The deterministic key_name means
+    # the revision's key is known before it is saved, so the revision and
+    # the entry's updated current-revision key can be written in a single
+    # batched put instead of two sequential ones
+    version = WikiRevision(key_name='%s:%d' % (page_title, version_number),
+                           version_number=version_number,
+                           revision_body=body, rendered_body=rendered_body,
+                           author=wiki_user, wiki_page=entry)
+    entry.current_revision = version
+    entry.latest_version = version_number
+    db.put([entry, version])
+
+    if version_number == 1:
+      # The page exists now, so drop any negative-cache verdict for it
+      memcache.delete('nx:%s' % page_title)
+
+    # Prime the render cache for the new revision so the view that
+    # follows the redirect skips even the datastore text fetch.  The
+    # cache is keyed by (title, version), so older entries simply stop
+    # being read and no explicit invalidation is needed
+    memcache.set('wb:%s:%d' % (page_title, version_number), rendered_body)
     # After the entry has been saved, direct the user back to view the page
     self.redirect('/view/' + page_title)
 
@@ -280,9 +467,15 @@ class UserProfileHandler(BaseRequestHandler):
     # Retrieve the unique set of articles the user has revised
     # Please note that this doesn't gaurentee that user's revision is
     # live on the wiki page
+    # Only the page titles are needed here, so project just the wiki_page
+    # key instead of shipping every full revision (whose bodies can be
+    # multi-KB) over the wire.  Titles are the key_name for migrated
+    # entries; the rare pre-migration key still fetches its entity
     article_list = []
-    for article in wiki_user.wikirevision_set:
-      article_list.append(article.wiki_page.title)
+    revision_query = db.Query(WikiRevision, projection=('wiki_page',))
+    for article in revision_query.filter('author =', wiki_user):
+      page_key = WikiRevision.wiki_page.get_value_for_datastore(article)
+      article_list.append(page_key.name() or db.get(page_key).title)
     articles = set(article_list)
 
     # If the user has specified a feed, fetch it
@@ -310,17 +503,25 @@ class EditUserProfileHandler(BaseRequestHandler):
     unescaped_user = urllib.unquote(user)
     wiki_user_object = users.User(unescaped_user)
     # Only that user can edit his or her profile
-    if users.get_current_user() != wiki_user_object:
+    if self.current_user() != wiki_user_object:
       self.redirect('/view/StartPage')
+      return
 
     wiki_user = WikiUser.gql('WHERE wiki_user = :1', wiki_user_object).get()
     if not wiki_user:
-      wiki_user = WikiUser(wiki_user=wiki_user_object)
-      wiki_user.put()
-
+      # The check above means this is the signed-in user, so the profile
+      # can be created keyed and cached like any other
+      wiki_user = _get_wiki_user(self.current_user())
+
+    # Only the page titles are needed here, so project just the wiki_page
+    # key instead of shipping every full revision (whose bodies can be
+    # multi-KB) over the wire.  Titles are the key_name for migrated
+    # entries; the rare pre-migration key still fetches its entity
     article_list = []
-    for article in wiki_user.wikirevision_set:
-      article_list.append(article.wiki_page.title)
+    revision_query = db.Query(WikiRevision, projection=('wiki_page',))
+    for article in revision_query.filter('author =', wiki_user):
+      page_key = WikiRevision.wiki_page.get_value_for_datastore(article)
+      article_list.append(page_key.name() or db.get(page_key).title)
     articles = set(article_list)
     self.generate('edit_user.html', template_values={'queried_user': wiki_user,
                                                      'articles': articles})
@@ -330,8 +531,9 @@ class EditUserProfileHandler(BaseRequestHandler):
     unescaped_user = urllib.unquote(user)
     wiki_user_object = users.User(unescaped_user)
     # Only that user can edit his or her profile
-    if users.get_current_user() != wiki_user_object:
+    if self.current_user() != wiki_user_object:
       self.redirect('/view/StartPage')
+      return
 
     wiki_user = WikiUser.gql('WHERE wiki_user = :1', wiki_user_object).get()
 
@@ -347,6 +549,8 @@ class EditUserProfileHandler(BaseRequestHandler):
 
     wiki_user.put()
 
+    # Drop the cached copy of the profile so later requests see the edit
+    memcache.delete('wu:%s' % self.current_user().user_id())
 
     self.redirect('/user/%s' % user)
 
@@ -363,7 +567,7 @@ class GetUserPhotoHandler(BaseRequestHandler):
     unescaped_user = urllib.unquote(user)
     wiki_user_object = users.User(unescaped_user)
     # Only that user can edit his or her profile
-    if users.get_current_user() != wiki_user_object:
+    if self.current_user() != wiki_user_object:
       self.redirect('/view/StartPage')
 
     wiki_user = WikiUser.gql('WHERE wiki_user = :1', wiki_user_object).get()
@@ -380,7 +584,7 @@ class SendAdminEmail(BaseRequestHandler):
   """
   def get(self):
     # Check to see if the user is signed in
-    current_user = users.get_current_user()
+    current_user = self.current_user()
 
     if not current_user:
       self.redirect(users.create_login_url('/sendadminemail'))
@@ -390,7 +594,7 @@ class SendAdminEmail(BaseRequestHandler):
 
   def post(self):
     # Check to see if the user is signed in
-    current_user = users.get_current_user()
+    current_user = self.current_user()
 
     if not current_user:
       self.redirect(users.create_login_url('/sendadminemail'))
@@ -406,6 +610,72 @@ class SendAdminEmail(BaseRequestHandler):
     # Generate the confirmation template
     self.generate('confirm_email.html')
 
+class PrefixDispatchApplication(webapp.WSGIApplication):
+  """WSGIApplication that dispatches on the first path segment.
+
+     Every pattern in our route table starts with a distinct literal
+     segment, so one split and a dict lookup replace the linear scan of
+     compiled route regexes webapp runs per request.  Paths the table
+     doesn't recognize (and argument segments the old patterns would
+     have rejected) fall back to the regex dispatch
+  """
+
+  # The verbs webapp itself dispatches; anything else is answered 501
+  # rather than resolved to an arbitrary handler attribute
+  _HTTP_METHODS = frozenset(['GET', 'POST', 'HEAD', 'OPTIONS', 'PUT',
+                             'DELETE', 'TRACE'])
+
+  def __init__(self, url_mapping, debug=False):
+    webapp.WSGIApplication.__init__(self, url_mapping, debug=debug)
+    self._debug = debug
+    # Build segment -> (handler class, takes an argument) from the route
+    # table; a capture group in the pattern means the handler wants the
+    # trailing path segment as its argument
+    self._prefix_mapping = {}
+    for pattern, handler_class in url_mapping:
+      segment = pattern.strip('/').split('/')[0]
+      self._prefix_mapping[segment] = (handler_class, '(' in pattern)
+
+  def __call__(self, environ, start_response):
+    # Quote like webob's request.path (safe set '/~') so handlers see
+    # exactly the argument values the regex groups used to hand them
+    path = urllib.quote(environ.get('PATH_INFO', '/'), '/~')
+    parts = path.split('/', 2)
+    segment = parts[1] if len(parts) > 1 else ''
+    argument = parts[2] if len(parts) > 2 else None
+
+    route = self._prefix_mapping.get(segment)
+    if route:
+      handler_class, takes_argument = route
+      if takes_argument:
+        # The old patterns required one non-empty slash-free segment
+        matches = argument and '/' not in argument
+      else:
+        matches = argument is None
+      if matches:
+        request = self.REQUEST_CLASS(environ)
+        response = self.RESPONSE_CLASS()
+        handler = handler_class()
+        handler.initialize(request, response)
+        method_name = environ['REQUEST_METHOD']
+        if method_name not in self._HTTP_METHODS:
+          handler.error(501)
+        else:
+          method = getattr(handler, method_name.lower())
+          try:
+            if takes_argument:
+              method(argument)
+            else:
+              method()
+          except Exception, e:
+            handler.handle_exception(e, self._debug)
+        response.wsgi_write(start_response)
+        return ['']
+
+    # Unrecognized path; let the regex table (and its 404) handle it
+    return webapp.WSGIApplication.__call__(self, environ, start_response)
+
+
 _WIKI_URLS = [('/', MainHandler),
               ('/view/([^/]+)', ViewHandler),
               ('/edit/([^/]+)', EditHandler),
@@ -416,7 +686,7 @@ _WIKI_URLS = [('/', MainHandler),
               ('/sendadminemail', SendAdminEmail)]
 
 def main():
-  application = webapp.WSGIApplication(_WIKI_URLS, debug=_DEBUG)
+  application = PrefixDispatchApplication(_WIKI_URLS, debug=_DEBUG)
   wsgiref.handlers.CGIHandler().run(application)
 
 if __name__ == '__main__':
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Copyright 2008 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+__author__ = 'appengine-support@google.com'
+
+"""One-off migration that re-keys WikiContent entities by title.
+
+Entries created before titles became the entity key_name have system
+assigned numeric ids, so WikiContent.get_by_key_name misses them.  For
+each such entry this script writes a copy keyed by its title, repoints
+the entry's WikiRevisions at the copy, and deletes the original.
+
+Run once against the live app through the remote API:
+
+  python migrate_content_keys.py <app_id>
+"""
+
+import getpass
+import sys
+
+from google.appengine.ext import db
+from google.appengine.ext.remote_api import remote_api_stub
+
+from wiki_model import WikiContent
+from wiki_model import WikiRevision
+
+
+def auth_func():
+  return raw_input('Email: '), getpass.getpass('Password: ')
+
+
+def migrate():
+  """Re-keys every WikiContent entity that still has a numeric id"""
+  for entry in WikiContent.all():
+    if entry.key().name():
+      # Already keyed by title
+      continue
+
+    new_entry = WikiContent(key_name=entry.title, title=entry.title)
+    new_entry.current_revision = \
+        WikiContent.current_revision.get_value_for_datastore(entry)
+    new_entry.latest_version = entry.latest_version
+    new_entry.put()
+
+    # Repoint this entry's revisions at the re-keyed copy.  Repointed
+    # revisions drop out of the filter, so refetching until the query
+    # comes back empty drains pages with more than a batch of revisions
+    # instead of leaving stragglers aimed at the entity deleted below
+    migrated = 0
+    while True:
+      revisions = WikiRevision.all().filter('wiki_page =', entry).fetch(1000)
+      if not revisions:
+        break
+      for revision in revisions:
+        revision.wiki_page = new_entry
+      db.put(revisions)
+      migrated += len(revisions)
+
+    db.delete(entry)
+    print 'Migrated %s (%d revisions)' % (entry.title, migrated)
+
+
+def main():
+  if len(sys.argv) != 2:
+    print 'Usage: %s <app_id>' % sys.argv[0]
+    sys.exit(1)
+
+  app_id = sys.argv[1]
+  remote_api_stub.ConfigureRemoteApi(None, '/_ah/remote_api', auth_func,
+                                     '%s.appspot.com' % app_id)
+  migrate()
+
+
+if __name__ == '__main__':
+  main()
@@ -29,11 +29,23 @@ class WikiUser(db.Model):
 
 class WikiContent(db.Model):
   title = db.StringProperty(required=True)
+  # Denormalized key of the latest WikiRevision for this page.  Readers
+  # can fetch the current revision with a direct keyed get instead of an
+  # ORDER BY version_number query
+  current_revision = db.ReferenceProperty(collection_name='current_revision_of')
+  # Denormalized version number of the latest revision, so the save path
+  # can number the next revision without fetching any revision at all.
+  # Zero means the counter hasn't been written yet (pre-migration entry)
+  latest_version = db.IntegerProperty(default=0)
 
 
 class WikiRevision(db.Model):
   wiki_page = db.ReferenceProperty(WikiContent)
   revision_body = db.TextProperty(required=True)
+  # HTML produced from revision_body (wiki-word links plus markdown) at
+  # save time, so the read path serves it without re-rendering.  Unset
+  # on revisions saved before rendering moved to the save path
+  rendered_body = db.TextProperty()
   author = db.ReferenceProperty(WikiUser)
   created = db.DateTimeProperty(auto_now_add=True)
   version_number = db.IntegerProperty()
\ No newline at end of file